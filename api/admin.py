@@ -1,5 +1,8 @@
 from django.contrib import admin
+from django.contrib.admin.views.main import ChangeList
 from django.contrib.auth.admin import UserAdmin
+from django.db.models import BooleanField, ExpressionWrapper, Q
+from django.db.models.functions import Now
 from .models import CustomUser, Book, Rental
 
 
@@ -27,12 +30,23 @@ class CustomUserAdmin(UserAdmin):
     )
 
 
+class BookChangeList(ChangeList):
+    """Changelist that leaves the description and search vector columns unread"""
+    def get_queryset(self, request, exclude_parameters=None):
+        return super().get_queryset(request, exclude_parameters).only(
+            'id', *self.model_admin.list_display,
+        )
+
+
 @admin.register(Book)
 class BookAdmin(admin.ModelAdmin):
     list_display = ('title', 'author', 'isbn', 'genre', 'total_copies', 'available_copies', 'publication_date', 'created_at')
     list_filter = ('genre', 'publication_date', 'created_at')
     search_fields = ('title', 'author', 'isbn', 'description')
     ordering = ('-created_at',)
+    list_per_page = 50
+    list_max_show_all = 200
+    show_full_result_count = False  # Skip the extra unfiltered COUNT(*) on filtered pages
     readonly_fields = ('id', 'created_at', 'updated_at')
     
     fieldsets = (
@@ -51,16 +65,30 @@ class BookAdmin(admin.ModelAdmin):
         }),
     )
     
-    def get_queryset(self, request):
-        return super().get_queryset(request)
+    def get_changelist(self, request, **kwargs):
+        return BookChangeList
+
+
+class RentalChangeList(ChangeList):
+    """Changelist that only fetches the columns rendered in list_display"""
+    def get_queryset(self, request, exclude_parameters=None):
+        return super().get_queryset(request, exclude_parameters).only(
+            'id', 'status', 'rented_at', 'due_date', 'returned_at',
+            'user__email', 'book__title', 'book__author',
+        )
 
 
 @admin.register(Rental)
 class RentalAdmin(admin.ModelAdmin):
     list_display = ('user_email', 'book_title', 'book_author', 'status', 'rented_at', 'due_date', 'returned_at', 'is_overdue')
+    list_select_related = ('user', 'book')
     list_filter = ('status', 'rented_at', 'due_date', 'returned_at')
     search_fields = ('user__email', 'user__first_name', 'user__last_name', 'book__title', 'book__author')
+    autocomplete_fields = ('user', 'book')
     ordering = ('-rented_at',)
+    list_per_page = 50
+    list_max_show_all = 200
+    show_full_result_count = False  # Skip the extra unfiltered COUNT(*) on filtered pages
     readonly_fields = ('id', 'rented_at', 'created_at', 'updated_at', 'is_overdue')
     
     fieldsets = (
@@ -76,6 +104,17 @@ class RentalAdmin(admin.ModelAdmin):
         }),
     )
     
+    def get_queryset(self, request):
+        return super().get_queryset(request).select_related('user', 'book').annotate(
+            is_overdue_ann=ExpressionWrapper(
+                Q(status=Rental.Status.ACTIVE) & Q(due_date__lt=Now()),
+                output_field=BooleanField()
+            )
+        )
+    
+    def get_changelist(self, request, **kwargs):
+        return RentalChangeList
+    
     def user_email(self, obj):
         return obj.user.email
     user_email.short_description = 'User Email'
@@ -87,4 +126,10 @@ class RentalAdmin(admin.ModelAdmin):
     book_title.admin_order_field = 'book__title'
     
     def book_author(self, obj):
-        return obj.book.author
\ No newline at end of file
+        return obj.book.author
+    
+    def is_overdue(self, obj):
+        return obj.is_overdue_ann
+    is_overdue.short_description = 'Is Overdue'
+    is_overdue.boolean = True
+    is_overdue.admin_order_field = 'is_overdue_ann'
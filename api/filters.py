@@ -1,6 +1,47 @@
 import django_filters
-from django.db import models
-from .models import Book, Rental
+from django_filters.rest_framework import DjangoFilterBackend
+from django.contrib.postgres.search import SearchQuery, SearchRank
+from django.db import connections, models
+from django.utils import timezone
+from .models import CustomUser, Book, Rental
+
+
+class SlugChoiceFilter(django_filters.ChoiceFilter):
+    """Choice filter that accepts integer choices by their slug"""
+    
+    def __init__(self, *args, choices_class, **kwargs):
+        self.choices_class = choices_class
+        kwargs['choices'] = choices_class.slug_choices()
+        super().__init__(*args, **kwargs)
+    
+    def filter(self, qs, value):
+        if value:
+            value = self.choices_class.from_slug(value)
+        return super().filter(qs, value)
+
+
+class QueryParamFilterBackend(DjangoFilterBackend):
+    """
+    DjangoFilterBackend that skips building and validating the filterset when
+    the request has no query parameters besides the page number
+    """
+    
+    def filter_queryset(self, request, queryset, view):
+        page_query_param = getattr(getattr(view, 'paginator', None), 'page_query_param', None)
+        if all(param == page_query_param for param in request.query_params):
+            return queryset
+        return super().filter_queryset(request, queryset, view)
+
+
+class UserFilter(django_filters.FilterSet):
+    """Filter for users"""
+    
+    # Role filter
+    role = SlugChoiceFilter(choices_class=CustomUser.Role)
+    
+    class Meta:
+        model = CustomUser
+        fields = ['role', 'is_active']
 
 
 class BookFilter(django_filters.FilterSet):
@@ -10,7 +51,7 @@ class BookFilter(django_filters.FilterSet):
     search = django_filters.CharFilter(method='filter_search', label='Search')
     
     # Genre filter
-    genre = django_filters.ChoiceFilter(choices=Book.GENRE_CHOICES)
+    genre = SlugChoiceFilter(choices_class=Book.Genre)
     
     # Author filter (case-insensitive partial match)
     author = django_filters.CharFilter(lookup_expr='icontains')
@@ -36,7 +77,18 @@ class BookFilter(django_filters.FilterSet):
     def filter_search(self, queryset, name, value):
         """
         Filter books by searching across title, author, and description.
+        
+        On PostgreSQL this is a ranked full-text match on the pre-computed
+        search_vector column; other databases use substring matching.
         """
+        if value and connections[queryset.db].vendor == 'postgresql':
+            query = SearchQuery(value, config='english')
+            return queryset.annotate(
+                rank=SearchRank(models.F('search_vector'), query)
+            ).filter(
+                models.Q(search_vector=query) |
+                models.Q(isbn__icontains=value)
+            ).order_by('-rank')
         if value:
             return queryset.filter(
                 models.Q(title__icontains=value) |
@@ -59,7 +111,7 @@ class RentalFilter(django_filters.FilterSet):
     """Filter for rentals"""
     
     # Status filter
-    status = django_filters.ChoiceFilter(choices=Rental.STATUS_CHOICES)
+    status = SlugChoiceFilter(choices_class=Rental.Status)
     
     # User filter (for admin use)
     user_email = django_filters.CharFilter(field_name='user__email', lookup_expr='icontains')
@@ -86,5 +138,9 @@ class RentalFilter(django_filters.FilterSet):
         Filter to show only overdue rentals.
         """
         if value:
-            return queryset.filter(status='overdue')
+            # Include active rentals past due that mark_overdue_rentals hasn't flipped yet
+            return queryset.filter(
+                models.Q(status=Rental.Status.OVERDUE) |
+                models.Q(status=Rental.Status.ACTIVE, due_date__lt=timezone.now())
+            )
         return queryset 
\ No newline at end of file
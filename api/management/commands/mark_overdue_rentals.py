@@ -0,0 +1,19 @@
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+
+from api.models import Rental
+
+
+class Command(BaseCommand):
+    """
+    Flip active rentals past their due date to overdue
+    """
+    help = 'Mark active rentals past their due date as overdue (run periodically, e.g. from cron)'
+
+    def handle(self, *args, **options):
+        updated = Rental.objects.filter(
+            status=Rental.Status.ACTIVE,
+            due_date__lt=timezone.now(),
+        ).update(status=Rental.Status.OVERDUE, updated_at=timezone.now())
+
+        self.stdout.write(self.style.SUCCESS(f'Marked {updated} rental(s) as overdue'))
@@ -0,0 +1,154 @@
+import random
+from collections import Counter
+from datetime import date, timedelta
+
+from django.contrib.auth.hashers import make_password
+from django.core.management.base import BaseCommand
+from django.db import connection, transaction
+from django.db.models import F
+from django.utils import timezone
+
+from api.models import CustomUser, Book, Rental
+from api.signals import bump_book_catalog_version
+
+
+BATCH_SIZE = 1000
+
+AUTHORS = [
+    'Jane Austen', 'George Orwell', 'Agatha Christie', 'J.R.R. Tolkien',
+    'Isaac Asimov', 'Toni Morrison', 'Haruki Murakami', 'Ursula K. Le Guin',
+    'Chinua Achebe', 'Margaret Atwood',
+]
+
+
+class Command(BaseCommand):
+    """
+    Populate the database with sample users, books and rentals
+    """
+    help = 'Populate the database with sample users, books and rentals'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--users', type=int, default=10, help='Number of regular users to create')
+        parser.add_argument('--books', type=int, default=50, help='Number of books to create')
+        parser.add_argument('--rentals', type=int, default=20, help='Number of rentals to create')
+
+    def handle(self, *args, **options):
+        with transaction.atomic():
+            if connection.vendor == 'postgresql':
+                # Seed data is disposable; don't wait on WAL flush at commit
+                with connection.cursor() as cursor:
+                    cursor.execute('SET LOCAL synchronous_commit = OFF')
+
+            # Hash once; every sample account shares the same password
+            password = make_password('password123')
+            self.create_admin(password)
+            self.create_users(options['users'], password)
+            self.create_books(options['books'])
+            self.create_rentals(options['rentals'])
+
+        self.stdout.write(self.style.SUCCESS('Sample data populated successfully'))
+
+    def create_admin(self, password):
+        CustomUser.objects.get_or_create(
+            email='admin@example.com',
+            defaults={
+                'username': 'admin',
+                'first_name': 'Admin',
+                'last_name': 'User',
+                'role': CustomUser.Role.ADMIN,
+                'is_staff': True,
+                'is_superuser': True,
+                'password': password,
+            }
+        )
+
+    def create_users(self, count, password):
+        emails = [f'user{i}@example.com' for i in range(1, count + 1)]
+        existing_emails = set(
+            CustomUser.objects.filter(email__in=emails).values_list('email', flat=True)
+        )
+
+        users_to_create = [
+            CustomUser(
+                email=email,
+                username=f'user{i}',
+                first_name='User',
+                last_name=str(i),
+                password=password,
+            )
+            for i, email in enumerate(emails, start=1)
+            if email not in existing_emails
+        ]
+        CustomUser.objects.bulk_create(users_to_create, batch_size=BATCH_SIZE, ignore_conflicts=True)
+        self.stdout.write(f'Created {len(users_to_create)} users')
+
+    def create_books(self, count):
+        isbns = [f'978{i:010d}' for i in range(1, count + 1)]
+        existing_isbns = set(
+            Book.objects.filter(isbn__in=isbns).values_list('isbn', flat=True)
+        )
+
+        books_to_create = []
+        for i, isbn in enumerate(isbns, start=1):
+            if isbn in existing_isbns:
+                continue
+            copies = random.randint(1, 5)
+            books_to_create.append(Book(
+                title=f'Sample Book {i}',
+                author=random.choice(AUTHORS),
+                isbn=isbn,
+                publication_date=date(random.randint(1950, 2024), random.randint(1, 12), random.randint(1, 28)),
+                genre=random.choice(Book.Genre.values),
+                description=f'Description of sample book {i}',
+                total_copies=copies,
+                available_copies=copies,
+            ))
+        Book.objects.bulk_create(books_to_create, batch_size=BATCH_SIZE, ignore_conflicts=True)
+        self.stdout.write(f'Created {len(books_to_create)} books')
+
+    def create_rentals(self, count):
+        users = list(CustomUser.objects.filter(role=CustomUser.Role.USER).only('id'))
+        books = list(Book.objects.only('id', 'available_copies'))
+        if not users or not books:
+            return
+
+        # (user_id, book_id) pairs that already have an open rental
+        open_pairs = set(
+            Rental.objects.filter(
+                status__in=[Rental.Status.ACTIVE, Rental.Status.OVERDUE]
+            ).values_list('user_id', 'book_id')
+        )
+
+        now = timezone.now()
+        rentals_to_create = []
+        decrements = Counter()
+        for i in range(count):
+            user = users[i % len(users)]
+            book = books[i % len(books)]
+            if book.available_copies <= 0:
+                continue
+            if (user.id, book.id) in open_pairs:
+                continue
+            open_pairs.add((user.id, book.id))
+
+            due_date = now + timedelta(days=random.randint(-7, 21))
+            rentals_to_create.append(Rental(
+                user=user,
+                book=book,
+                due_date=due_date,
+                status=Rental.Status.OVERDUE if due_date < now else Rental.Status.ACTIVE,
+            ))
+
+            book.available_copies -= 1
+            decrements[book.id] += 1
+
+        Rental.objects.bulk_create(rentals_to_create, batch_size=BATCH_SIZE, ignore_conflicts=True)
+        # One UPDATE per batch of rented books instead of one save() per rental
+        books_to_update = [
+            Book(id=book_id, available_copies=F('available_copies') - rented, updated_at=now)
+            for book_id, rented in decrements.items()
+        ]
+        Book.objects.bulk_update(books_to_update, ['available_copies', 'updated_at'], batch_size=BATCH_SIZE)
+        # bulk_update sends no post_save signals
+        bump_book_catalog_version()
+        self.stdout.write(f'Created {len(rentals_to_create)} rentals')
@@ -0,0 +1,66 @@
+from django.db import migrations
+
+
+# String value -> integer code, frozen as of this migration
+ROLE_CODES = {'admin': 1, 'user': 2}
+
+GENRE_CODES = {
+    'fiction': 1,
+    'non_fiction': 2,
+    'mystery': 3,
+    'science_fiction': 4,
+    'fantasy': 5,
+    'romance': 6,
+    'thriller': 7,
+    'biography': 8,
+    'history': 9,
+    'self_help': 10,
+    'business': 11,
+    'technology': 12,
+    'education': 13,
+    'children': 14,
+    'young_adult': 15,
+    'other': 16,
+}
+
+STATUS_CODES = {'active': 1, 'returned': 2, 'overdue': 3}
+
+FIELDS = [
+    ('CustomUser', 'role', ROLE_CODES),
+    ('Book', 'genre', GENRE_CODES),
+    ('Rental', 'status', STATUS_CODES),
+]
+
+
+def rewrite_values(apps, mappings):
+    for model_name, field_name, mapping in mappings:
+        model = apps.get_model('api', model_name)
+        for old, new in mapping.items():
+            model.objects.filter(**{field_name: old}).update(**{field_name: new})
+
+
+def to_integer_codes(apps, schema_editor):
+    # Store the codes as digit strings so the following AlterField can cast
+    # the columns to integers in place
+    rewrite_values(apps, [
+        (model_name, field_name, {old: str(new) for old, new in mapping.items()})
+        for model_name, field_name, mapping in FIELDS
+    ])
+
+
+def to_string_values(apps, schema_editor):
+    rewrite_values(apps, [
+        (model_name, field_name, {str(new): old for old, new in mapping.items()})
+        for model_name, field_name, mapping in FIELDS
+    ])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.RunPython(to_integer_codes, to_string_values),
+    ]
@@ -0,0 +1,28 @@
+# Generated by Django 5.2.4 on 2026-10-15 09:26
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0002_choices_to_integer_codes'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='book',
+            name='genre',
+            field=models.PositiveSmallIntegerField(choices=[(1, 'Fiction'), (2, 'Non-Fiction'), (3, 'Mystery'), (4, 'Science Fiction'), (5, 'Fantasy'), (6, 'Romance'), (7, 'Thriller'), (8, 'Biography'), (9, 'History'), (10, 'Self Help'), (11, 'Business'), (12, 'Technology'), (13, 'Education'), (14, 'Children'), (15, 'Young Adult'), (16, 'Other')], db_index=True),
+        ),
+        migrations.AlterField(
+            model_name='customuser',
+            name='role',
+            field=models.PositiveSmallIntegerField(choices=[(1, 'Admin'), (2, 'User')], default=2),
+        ),
+        migrations.AlterField(
+            model_name='rental',
+            name='status',
+            field=models.PositiveSmallIntegerField(choices=[(1, 'Active'), (2, 'Returned'), (3, 'Overdue')], db_index=True, default=1),
+        ),
+    ]
@@ -0,0 +1,31 @@
+from django.db import migrations
+
+from api.operations import RunSQLOnPostgreSQL
+
+
+def trigram_index(name, column):
+    # icontains compiles to UPPER(column::text) LIKE UPPER(%s) on PostgreSQL,
+    # so the index is built over the same expression
+    return RunSQLOnPostgreSQL(
+        sql=f'CREATE INDEX {name} ON books USING gin (UPPER({column}) gin_trgm_ops)',
+        reverse_sql=f'DROP INDEX IF EXISTS {name}',
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0003_alter_choice_fields_to_integers'),
+    ]
+
+    operations = [
+        # CreateExtension's reverse isn't vendor-guarded and fails on SQLite
+        RunSQLOnPostgreSQL(
+            sql='CREATE EXTENSION IF NOT EXISTS pg_trgm',
+            reverse_sql='DROP EXTENSION IF EXISTS pg_trgm',
+        ),
+        trigram_index('book_title_trgm', 'title'),
+        trigram_index('book_author_trgm', 'author'),
+        trigram_index('book_description_trgm', 'description'),
+        trigram_index('book_isbn_trgm', 'isbn'),
+    ]
@@ -0,0 +1,55 @@
+# Generated by Django 5.2.4 on 2026-10-15 09:30
+
+import django.contrib.postgres.search
+from django.db import migrations
+
+from api.operations import RunSQLOnPostgreSQL
+
+
+SEARCH_VECTOR_SQL = """
+    setweight(to_tsvector('pg_catalog.english', coalesce({row}title, '')), 'A') ||
+    setweight(to_tsvector('pg_catalog.english', coalesce({row}author, '')), 'B') ||
+    setweight(to_tsvector('pg_catalog.english', coalesce({row}description, '')), 'C')
+"""
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0004_book_trigram_indexes'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='book',
+            name='search_vector',
+            field=django.contrib.postgres.search.SearchVectorField(editable=False, null=True),
+        ),
+        RunSQLOnPostgreSQL(
+            sql=[
+                f"""
+                CREATE FUNCTION books_search_vector_update() RETURNS trigger AS $$
+                BEGIN
+                    NEW.search_vector := {SEARCH_VECTOR_SQL.format(row='NEW.')};
+                    RETURN NEW;
+                END
+                $$ LANGUAGE plpgsql
+                """,
+                """
+                CREATE TRIGGER books_search_vector_trigger
+                BEFORE INSERT OR UPDATE OF title, author, description, search_vector ON books
+                FOR EACH ROW EXECUTE FUNCTION books_search_vector_update()
+                """,
+                f'UPDATE books SET search_vector = {SEARCH_VECTOR_SQL.format(row="")}',
+                'CREATE INDEX book_search_vector_gin ON books USING gin (search_vector)',
+                # Full-text search replaces substring matching on description
+                'DROP INDEX IF EXISTS book_description_trgm',
+            ],
+            reverse_sql=[
+                'CREATE INDEX book_description_trgm ON books USING gin (UPPER(description) gin_trgm_ops)',
+                'DROP INDEX IF EXISTS book_search_vector_gin',
+                'DROP TRIGGER IF EXISTS books_search_vector_trigger ON books',
+                'DROP FUNCTION IF EXISTS books_search_vector_update()',
+            ],
+        ),
+    ]
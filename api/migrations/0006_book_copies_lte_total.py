@@ -0,0 +1,17 @@
+# Generated by Django 5.2.4 on 2026-10-15 09:31
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0005_book_search_vector'),
+    ]
+
+    operations = [
+        migrations.AddConstraint(
+            model_name='book',
+            constraint=models.CheckConstraint(condition=models.Q(('available_copies__lte', models.F('total_copies'))), name='copies_lte_total'),
+        ),
+    ]
@@ -0,0 +1,29 @@
+# Generated by Django 5.2.4 on 2026-10-15 09:34
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0006_book_copies_lte_total'),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name='rental',
+            name='rentals_user_id_db383a_idx',
+        ),
+        migrations.RemoveIndex(
+            model_name='rental',
+            name='rentals_book_id_6dd25f_idx',
+        ),
+        migrations.AddIndex(
+            model_name='rental',
+            index=models.Index(fields=['user', '-rented_at'], include=('status', 'due_date', 'returned_at', 'book'), name='rental_user_hot_cov'),
+        ),
+        migrations.AddIndex(
+            model_name='rental',
+            index=models.Index(fields=['book', '-rented_at'], include=('status', 'due_date', 'returned_at', 'user'), name='rental_book_hot_cov'),
+        ),
+    ]
@@ -0,0 +1,24 @@
+# Generated by Django 5.2.4 on 2026-10-15 09:35
+
+import api.models
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0008_brin_time_indexes'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='book',
+            name='id',
+            field=models.UUIDField(default=api.models.uuid7, editable=False, primary_key=True, serialize=False),
+        ),
+        migrations.AlterField(
+            model_name='rental',
+            name='id',
+            field=models.UUIDField(default=api.models.uuid7, editable=False, primary_key=True, serialize=False),
+        ),
+    ]
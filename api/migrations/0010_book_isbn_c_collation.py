@@ -0,0 +1,33 @@
+# Generated by Django 5.2.4 on 2026-10-15 09:37
+
+from django.db import migrations, models
+
+from api.operations import RunSQLOnPostgreSQL
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0009_uuid7_primary_keys'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='book',
+            name='isbn',
+            field=models.CharField(max_length=13, unique=True),
+        ),
+        # ISBNs are plain ASCII; byte-wise comparison makes the unique index
+        # cheaper to probe and lets it serve LIKE 'prefix%' lookups, so the
+        # varchar_pattern_ops index Django adds for unique CharFields goes
+        RunSQLOnPostgreSQL(
+            sql=[
+                'ALTER TABLE books ALTER COLUMN isbn TYPE varchar(13) COLLATE "C"',
+                'DROP INDEX IF EXISTS books_isbn_6168c404_like',
+            ],
+            reverse_sql=[
+                'CREATE INDEX books_isbn_6168c404_like ON books (isbn varchar_pattern_ops)',
+                'ALTER TABLE books ALTER COLUMN isbn TYPE varchar(13) COLLATE "default"',
+            ],
+        ),
+    ]
@@ -0,0 +1,22 @@
+# Generated by Django 5.2.4 on 2026-10-15 09:38
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0010_book_isbn_c_collation'),
+        ('auth', '0012_alter_user_first_name_max_length'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='book',
+            index=models.Index(fields=['-created_at'], name='book_created_desc_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='customuser',
+            index=models.Index(fields=['-created_at'], name='user_created_desc_idx'),
+        ),
+    ]
@@ -0,0 +1,21 @@
+# Generated by Django 5.2.4 on 2026-10-15 09:39
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0011_created_at_desc_indexes'),
+    ]
+
+    operations = [
+        migrations.AlterUniqueTogether(
+            name='rental',
+            unique_together=set(),
+        ),
+        migrations.AddConstraint(
+            model_name='rental',
+            constraint=models.UniqueConstraint(condition=models.Q(('status__in', [1, 3])), fields=('user', 'book'), name='rental_one_open_per_user_book'),
+        ),
+    ]
@@ -0,0 +1,26 @@
+# Generated by Django 5.2.4 on 2026-10-15 09:50
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0012_rental_open_unique_constraint'),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name='rental',
+            name='rentals_due_dat_5b3f23_idx',
+        ),
+        migrations.AlterField(
+            model_name='rental',
+            name='status',
+            field=models.PositiveSmallIntegerField(choices=[(1, 'Active'), (2, 'Returned'), (3, 'Overdue')], default=1),
+        ),
+        migrations.AddIndex(
+            model_name='rental',
+            index=models.Index(fields=['status', 'due_date'], name='rentals_status_ff64d0_idx'),
+        ),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 5.2.4 on 2026-10-15 09:56
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0013_rental_status_due_date_index'),
+        ('auth', '0012_alter_user_first_name_max_length'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='customuser',
+            index=models.Index(fields=['role', 'is_active', '-created_at'], name='user_role_active_created_idx'),
+        ),
+    ]
@@ -0,0 +1,17 @@
+# Generated by Django 5.2.4 on 2026-10-15 09:56
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0014_user_role_active_created_idx'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='rental',
+            index=models.Index(fields=['status', '-rented_at'], name='rental_status_rented_desc_idx'),
+        ),
+    ]
@@ -1,21 +1,53 @@
 from django.contrib.auth.models import AbstractUser
+from django.contrib.postgres.search import SearchVectorField
 from django.db import models
 from django.core.validators import MinValueValidator, MaxValueValidator
 from django.utils import timezone
+from django.utils.functional import cached_property
+import os
+import time
 import uuid
 from django.core.exceptions import ValidationError
 
 
+def uuid7():
+    """
+    Time-ordered UUID (RFC 9562 version 7) so primary key inserts land on the
+    rightmost B-tree leaf instead of a random page
+    """
+    value = (time.time_ns() // 1_000_000) << 80 | int.from_bytes(os.urandom(10), 'big')
+    value &= ~(0xF000 << 64 | 0xC000 << 48)
+    value |= 0x7000 << 64 | 0x8000 << 48
+    return uuid.UUID(int=value)
+
+
+class SlugChoices(models.IntegerChoices):
+    """
+    Integer choices that API clients refer to by their lowercase member name
+    """
+    
+    @property
+    def slug(self):
+        return self.name.lower()
+    
+    @classmethod
+    def from_slug(cls, slug):
+        return cls[slug.upper()]
+    
+    @classmethod
+    def slug_choices(cls):
+        return [(member.slug, member.label) for member in cls]
+
+
 class CustomUser(AbstractUser):
-    ROLE_CHOICES = [
-        ('admin', 'Admin'),
-        ('user', 'User'),
-    ]
+    class Role(SlugChoices):
+        ADMIN = 1, 'Admin'
+        USER = 2, 'User'
     
     email = models.EmailField(unique=True)
     first_name = models.CharField(max_length=30)
     last_name = models.CharField(max_length=30)
-    role = models.CharField(max_length=10, choices=ROLE_CHOICES, default='user')
+    role = models.PositiveSmallIntegerField(choices=Role.choices, default=Role.USER)
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
     
@@ -26,40 +58,55 @@ class CustomUser(AbstractUser):
         db_table = 'users'
         verbose_name = 'User'
         verbose_name_plural = 'Users'
+        indexes = [
+            models.Index(fields=['-created_at'], name='user_created_desc_idx'),
+            # UserListView's role/is_active filters, newest first
+            models.Index(fields=['role', 'is_active', '-created_at'], name='user_role_active_created_idx'),
+        ]
     
     def __str__(self):
         return f"{self.first_name} {self.last_name} ({self.email})"
+    
+    @property
+    def full_name(self):
+        return f"{self.first_name} {self.last_name}"
+    
+    @cached_property
+    def is_admin(self):
+        return self.role == self.Role.ADMIN
 
 
 class Book(models.Model):
-    GENRE_CHOICES = [
-        ('fiction', 'Fiction'),
-        ('non_fiction', 'Non-Fiction'),
-        ('mystery', 'Mystery'),
-        ('science_fiction', 'Science Fiction'),
-        ('fantasy', 'Fantasy'),
-        ('romance', 'Romance'),
-        ('thriller', 'Thriller'),
-        ('biography', 'Biography'),
-        ('history', 'History'),
-        ('self_help', 'Self Help'),
-        ('business', 'Business'),
-        ('technology', 'Technology'),
-        ('education', 'Education'),
-        ('children', 'Children'),
-        ('young_adult', 'Young Adult'),
-        ('other', 'Other'),
-    ]
-    
-    id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
+    class Genre(SlugChoices):
+        FICTION = 1, 'Fiction'
+        NON_FICTION = 2, 'Non-Fiction'
+        MYSTERY = 3, 'Mystery'
+        SCIENCE_FICTION = 4, 'Science Fiction'
+        FANTASY = 5, 'Fantasy'
+        ROMANCE = 6, 'Romance'
+        THRILLER = 7, 'Thriller'
+        BIOGRAPHY = 8, 'Biography'
+        HISTORY = 9, 'History'
+        SELF_HELP = 10, 'Self Help'
+        BUSINESS = 11, 'Business'
+        TECHNOLOGY = 12, 'Technology'
+        EDUCATION = 13, 'Education'
+        CHILDREN = 14, 'Children'
+        YOUNG_ADULT = 15, 'Young Adult'
+        OTHER = 16, 'Other'
+    
+    id = models.UUIDField(primary_key=True, default=uuid7, editable=False)
     title = models.CharField(max_length=200, db_index=True)
     author = models.CharField(max_length=200, db_index=True)
-    isbn = models.CharField(max_length=13, unique=True, db_index=True)
+    # Byte-wise "C" collation on PostgreSQL (migration 0010)
+    isbn = models.CharField(max_length=13, unique=True)
     publication_date = models.DateField()
-    genre = models.CharField(max_length=20, choices=GENRE_CHOICES, db_index=True)
+    genre = models.PositiveSmallIntegerField(choices=Genre.choices, db_index=True)
     description = models.TextField(blank=True)
     total_copies = models.PositiveIntegerField(validators=[MinValueValidator(1)])
     available_copies = models.PositiveIntegerField(validators=[MinValueValidator(0)])
+    # Maintained by a database trigger on PostgreSQL (migration 0005)
+    search_vector = SearchVectorField(null=True, editable=False)
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
     
@@ -67,9 +114,18 @@ class Book(models.Model):
         db_table = 'books'
         verbose_name = 'Book'
         verbose_name_plural = 'Books'
+        # PostgreSQL-only search and BRIN indexes backing BookFilter live in
+        # migrations 0004, 0005 and 0008
         indexes = [
             models.Index(fields=['title', 'author']),
             models.Index(fields=['genre', 'publication_date']),
+            models.Index(fields=['-created_at'], name='book_created_desc_idx'),
+        ]
+        constraints = [
+            models.CheckConstraint(
+                condition=models.Q(available_copies__lte=models.F('total_copies')),
+                name='copies_lte_total',
+            ),
         ]
     
     def __str__(self):
@@ -78,26 +134,21 @@ class Book(models.Model):
     def clean(self):
         if self.available_copies > self.total_copies:
             raise ValidationError("Available copies cannot exceed total copies")
-    
-    def save(self, *args, **kwargs):
-        self.full_clean()
-        super().save(*args, **kwargs)
 
 
 class Rental(models.Model):
-    STATUS_CHOICES = [
-        ('active', 'Active'),
-        ('returned', 'Returned'),
-        ('overdue', 'Overdue'),
-    ]
+    class Status(SlugChoices):
+        ACTIVE = 1, 'Active'
+        RETURNED = 2, 'Returned'
+        OVERDUE = 3, 'Overdue'
     
-    id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
+    id = models.UUIDField(primary_key=True, default=uuid7, editable=False)
     user = models.ForeignKey(CustomUser, on_delete=models.CASCADE, related_name='rentals')
     book = models.ForeignKey(Book, on_delete=models.CASCADE, related_name='rentals')
     rented_at = models.DateTimeField(auto_now_add=True)
     due_date = models.DateTimeField()
     returned_at = models.DateTimeField(null=True, blank=True)
-    status = models.CharField(max_length=10, choices=STATUS_CHOICES, default='active', db_index=True)
+    status = models.PositiveSmallIntegerField(choices=Status.choices, default=Status.ACTIVE)
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
     
@@ -105,21 +156,37 @@ class Rental(models.Model):
         db_table = 'rentals'
         verbose_name = 'Rental'
         verbose_name_plural = 'Rentals'
+        # PostgreSQL-only BRIN indexes for the date range filters live in
+        # migration 0008
         indexes = [
-            models.Index(fields=['user', 'status']),
-            models.Index(fields=['book', 'status']),
-            models.Index(fields=['due_date', 'status']),
+            # Cover the per-user/per-book rental lists (newest first) so the
+            # displayed columns come straight from the index on PostgreSQL
+            models.Index(
+                fields=['user', '-rented_at'],
+                include=['status', 'due_date', 'returned_at', 'book'],
+                name='rental_user_hot_cov',
+            ),
+            models.Index(
+                fields=['book', '-rented_at'],
+                include=['status', 'due_date', 'returned_at', 'user'],
+                name='rental_book_hot_cov',
+            ),
+            # Equality on status first, then the due_date range (overdue sweeps)
+            models.Index(fields=['status', 'due_date']),
+            # Admin rental list filtered by status, newest first
+            models.Index(fields=['status', '-rented_at'], name='rental_status_rented_desc_idx'),
+        ]
+        constraints = [
+            # Prevent multiple open rentals of same book by same user
+            models.UniqueConstraint(
+                fields=['user', 'book'],
+                condition=models.Q(status__in=[1, 3]),  # Status.ACTIVE, Status.OVERDUE
+                name='rental_one_open_per_user_book',
+            ),
         ]
-        unique_together = ['user', 'book', 'status']  # Prevent multiple active rentals of same book by same user
     
     def __str__(self):
-        return f"{self.user.email} - {self.book.title} ({self.status})"
+        return f"{self.user.email} - {self.book.title} ({self.get_status_display()})"
     
     def is_overdue(self):
-        return self.status == 'active' and timezone.now() > self.due_date
-    
-    def save(self, *args, **kwargs):
-        # Auto-update status if overdue
-        if self.status == 'active' and timezone.now() > self.due_date:
-            self.status = 'overdue'
-        super().save(*args, **kwargs)
+        return self.status == self.Status.ACTIVE and timezone.now() > self.due_date
@@ -0,0 +1,20 @@
+from django.db import migrations
+
+
+class RunSQLOnPostgreSQL(migrations.RunSQL):
+    """
+    RunSQL that only executes on PostgreSQL.
+
+    Used for PostgreSQL-specific schema objects (extension indexes, triggers,
+    collations) that the SQLite development database cannot represent. These
+    objects are kept out of the model state so table rebuilds on SQLite never
+    try to recreate them.
+    """
+
+    def database_forwards(self, app_label, schema_editor, from_state, to_state):
+        if schema_editor.connection.vendor == 'postgresql':
+            super().database_forwards(app_label, schema_editor, from_state, to_state)
+
+    def database_backwards(self, app_label, schema_editor, from_state, to_state):
+        if schema_editor.connection.vendor == 'postgresql':
+            super().database_backwards(app_label, schema_editor, from_state, to_state)
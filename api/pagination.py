@@ -0,0 +1,47 @@
+from django.core.paginator import Paginator
+from django.db import connections
+from django.utils.functional import cached_property
+from rest_framework.pagination import PageNumberPagination
+
+
+class EstimatedCountPaginator(Paginator):
+    """
+    Paginator that reads the row count of an unfiltered PostgreSQL table from
+    the planner statistics instead of running SELECT COUNT(*) on every page
+    """
+    # Below this many rows an exact count is cheap and the estimate is the
+    # least reliable, so the real count is used
+    estimate_threshold = 10000
+    
+    @cached_property
+    def count(self):
+        estimate = self.estimated_count()
+        if estimate is not None and estimate >= self.estimate_threshold:
+            return estimate
+        return super().count
+    
+    def estimated_count(self):
+        queryset = self.object_list
+        query = getattr(queryset, 'query', None)
+        if query is None or query.where or query.distinct or query.is_sliced:
+            return None
+        
+        connection = connections[queryset.db]
+        if connection.vendor != 'postgresql':
+            return None
+        
+        with connection.cursor() as cursor:
+            cursor.execute(
+                'SELECT reltuples::bigint FROM pg_class WHERE oid = %s::regclass',
+                [queryset.model._meta.db_table]
+            )
+            row = cursor.fetchone()
+        # reltuples is -1 until the table has been vacuumed or analyzed
+        return row[0] if row and row[0] >= 0 else None
+
+
+class EstimatedCountPagination(PageNumberPagination):
+    """
+    Page number pagination with an estimated count for unfiltered lists
+    """
+    django_paginator_class = EstimatedCountPaginator
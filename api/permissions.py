@@ -9,7 +9,7 @@ class IsAdminUser(permissions.BasePermission):
         return (
             request.user and 
             request.user.is_authenticated and 
-            request.user.role == 'admin'
+            request.user.is_admin
         )
 
 
@@ -23,7 +23,7 @@ class IsAdminOrReadOnly(permissions.BasePermission):
         return (
             request.user and 
             request.user.is_authenticated and 
-            request.user.role == 'admin'
+            request.user.is_admin
         )
 
 
@@ -36,7 +36,7 @@ class IsOwnerOrAdmin(permissions.BasePermission):
     
     def has_object_permission(self, request, view, obj):
         # Admin can access any object
-        if request.user.role == 'admin':
+        if request.user.is_admin:
             return True
         
         # Check if the object has a user field and if it belongs to the requesting user
@@ -59,7 +59,7 @@ class IsAdminOrOwner(permissions.BasePermission):
     
     def has_object_permission(self, request, view, obj):
         # Admin can access any object
-        if request.user.role == 'admin':
+        if request.user.is_admin:
             return True
         
         # Users can only access their own objects
@@ -82,7 +82,7 @@ class CanManageBooks(permissions.BasePermission):
         return (
             request.user and 
             request.user.is_authenticated and 
-            request.user.role == 'admin'
+            request.user.is_admin
         )
 
 
@@ -96,7 +96,7 @@ class CanManageRentals(permissions.BasePermission):
     
     def has_object_permission(self, request, view, obj):
         # Admin can access any rental
-        if request.user.role == 'admin':
+        if request.user.is_admin:
             return True
         
         # Users can only access their own rentals
@@ -1,38 +1,52 @@
 from rest_framework import serializers
+from rest_framework.settings import api_settings
 from rest_framework_simplejwt.serializers import TokenObtainPairSerializer
-from django.contrib.auth.password_validation import validate_password
-from django.contrib.auth import authenticate
+from django.contrib.auth.hashers import make_password
+from django.core.validators import MaxValueValidator
+from django.contrib.auth.validators import UnicodeUsernameValidator
+from django.db import IntegrityError, transaction
+from django.db.models import F, Q
 from django.utils import timezone
 from datetime import timedelta
 from drf_spectacular.utils import extend_schema_field
 from .models import CustomUser, Book, Rental
 
 
-# Minimal serializers for cleaner responses
-class UserMinimalSerializer(serializers.ModelSerializer):
-    """Minimal user serializer for login responses"""
-    full_name = serializers.SerializerMethodField()
+class SlugChoiceField(serializers.ChoiceField):
+    """Choice field that reads and writes integer choices by their slug"""
+    def __init__(self, choices_class, **kwargs):
+        self.choices_class = choices_class
+        super().__init__(choices=choices_class.slug_choices(), **kwargs)
     
-    class Meta:
-        model = CustomUser
-        fields = ('id', 'email', 'username', 'first_name', 'last_name', 'full_name', 'role')
+    def to_internal_value(self, data):
+        return self.choices_class.from_slug(super().to_internal_value(data))
     
-    @extend_schema_field(serializers.CharField)
-    def get_full_name(self, obj: CustomUser) -> str:
-        return f"{obj.first_name} {obj.last_name}"
+    def to_representation(self, value):
+        if value in ('', None):
+            return value
+        return self.choices_class(value).slug
+
 
+_ISBN_STRIP = str.maketrans('', '', '- \t')
 
+
+def _validate_isbn(value):
+    # Remove any hyphens, spaces or tabs for validation
+    isbn = value.translate(_ISBN_STRIP)
+    if len(isbn) not in [10, 13]:
+        raise serializers.ValidationError("ISBN must be 10 or 13 digits long.")
+    return isbn
+
+
+# Minimal serializers for cleaner responses
 class UserRegistrationResponseSerializer(serializers.ModelSerializer):
     """Minimal user serializer for registration responses"""
-    full_name = serializers.SerializerMethodField()
+    full_name = serializers.CharField(read_only=True)
+    role = SlugChoiceField(CustomUser.Role, read_only=True)
     
     class Meta:
         model = CustomUser
         fields = ('id', 'email', 'username', 'first_name', 'last_name', 'full_name', 'role')
-    
-    @extend_schema_field(serializers.CharField)
-    def get_full_name(self, obj: CustomUser) -> str:
-        return f"{obj.first_name} {obj.last_name}"
 
 
 class CustomTokenObtainPairSerializer(TokenObtainPairSerializer):
@@ -41,17 +55,15 @@ class CustomTokenObtainPairSerializer(TokenObtainPairSerializer):
     
     def __init__(self, *args, **kwargs):
         super().__init__(*args, **kwargs)
+        # TokenObtainSerializer adds a plain CharField for username_field
         self.fields['email'] = serializers.EmailField()
-        # Only delete username field if it exists
-        if 'username' in self.fields:
-            del self.fields['username']
     
     @classmethod
     def get_token(cls, user):
         token = super().get_token(user)
         token['email'] = user.email
-        token['role'] = user.role
-        token['full_name'] = f"{user.first_name} {user.last_name}"
+        token['role'] = CustomUser.Role(user.role).slug
+        token['full_name'] = user.full_name
         return token
     
     def validate(self, attrs):
@@ -59,9 +71,18 @@ class CustomTokenObtainPairSerializer(TokenObtainPairSerializer):
         password = attrs.get('password')
         
         if email and password:
-            user = authenticate(request=self.context.get('request'),
-                              email=email, password=password)
-            if not user:
+            # Look the user up directly instead of walking every
+            # AUTHENTICATION_BACKENDS entry, each repeating the query and hash
+            try:
+                user = CustomUser.objects.only(
+                    'id', 'email', 'username', 'password', 'is_active',
+                    'role', 'first_name', 'last_name'
+                ).get(email=email)
+            except CustomUser.DoesNotExist:
+                # Hash anyway so unknown emails take as long as wrong passwords
+                make_password(password)
+                raise serializers.ValidationError('Invalid email or password.')
+            if not user.check_password(password):
                 raise serializers.ValidationError('Invalid email or password.')
             if not user.is_active:
                 raise serializers.ValidationError('User account is disabled.')
@@ -72,56 +93,85 @@ class CustomTokenObtainPairSerializer(TokenObtainPairSerializer):
         return {
             'refresh': str(refresh),
             'access': str(refresh.access_token),
-            'user': UserMinimalSerializer(user).data
+            # Built inline rather than through a ModelSerializer on every login
+            'user': {
+                'id': user.id,
+                'email': user.email,
+                'username': user.username,
+                'first_name': user.first_name,
+                'last_name': user.last_name,
+                'full_name': user.full_name,
+                'role': CustomUser.Role(user.role).slug,
+            }
         }
 
 
 class UserRegistrationSerializer(serializers.ModelSerializer):
     """Serializer for user registration"""
-    password = serializers.CharField(write_only=True, validators=[validate_password])
+    password = serializers.CharField(write_only=True)
     password_confirm = serializers.CharField(write_only=True)
+    role = SlugChoiceField(CustomUser.Role, default=CustomUser.Role.USER)
     
     class Meta:
         model = CustomUser
         fields = ('email', 'username', 'first_name', 'last_name', 'password', 'password_confirm', 'role')
+        # Uniqueness is checked for both fields in one query in validate()
         extra_kwargs = {
-            'role': {'default': 'user'},
-            'username': {'required': True}
+            'email': {'validators': []},
+            'username': {'required': True, 'validators': [UnicodeUsernameValidator()]}
         }
     
+    def validate_password(self, value):
+        # Imported on first registration rather than with every API module load
+        from django.contrib.auth.password_validation import validate_password
+        validate_password(value)
+        return value
+    
     def validate(self, attrs):
         if attrs['password'] != attrs['password_confirm']:
             raise serializers.ValidationError("Passwords don't match.")
+        self.check_unique(attrs['email'], attrs['username'])
         return attrs
     
-    def validate_email(self, value):
-        if CustomUser.objects.filter(email=value).exists():
-            raise serializers.ValidationError("User with this email already exists.")
-        return value
-    
-    def validate_username(self, value):
-        if CustomUser.objects.filter(username=value).exists():
-            raise serializers.ValidationError("User with this username already exists.")
-        return value
+    def check_unique(self, email, username):
+        taken = CustomUser.objects.filter(
+            Q(email=email) | Q(username=username)
+        ).values_list('email', 'username')
+        errors = {}
+        for taken_email, taken_username in taken:
+            if taken_email == email:
+                errors['email'] = ["User with this email already exists."]
+            if taken_username == username:
+                errors['username'] = ["User with this username already exists."]
+        if errors:
+            raise serializers.ValidationError(errors)
     
     def create(self, validated_data):
         validated_data.pop('password_confirm')
-        user = CustomUser.objects.create_user(**validated_data)
+        try:
+            with transaction.atomic():
+                user = CustomUser.objects.create_user(**validated_data)
+        except IntegrityError:
+            # Lost a race with a concurrent registration
+            self.check_unique(validated_data['email'], validated_data['username'])
+            raise
         return user
 
 
 class UserProfileSerializer(serializers.ModelSerializer):
     """Serializer for user profile"""
-    full_name = serializers.SerializerMethodField()
+    full_name = serializers.CharField(read_only=True)
+    role = SlugChoiceField(CustomUser.Role, required=False)
     
     class Meta:
         model = CustomUser
         fields = ('id', 'email', 'username', 'first_name', 'last_name', 'full_name', 'role', 'created_at', 'updated_at')
         read_only_fields = ('id', 'created_at', 'updated_at')
     
-    @extend_schema_field(serializers.CharField)
-    def get_full_name(self, obj: CustomUser) -> str:
-        return f"{obj.first_name} {obj.last_name}"
+    @classmethod
+    def prefetch_queryset(cls, queryset):
+        """Load only the columns the profile renders, leaving out the password hash and flags"""
+        return queryset.only(*(field for field in cls.Meta.fields if field != 'full_name'))
 
 
 class UserUpdateSerializer(serializers.ModelSerializer):
@@ -140,10 +190,12 @@ class UserUpdateSerializer(serializers.ModelSerializer):
 class BookSerializer(serializers.ModelSerializer):
     """Serializer for Book model"""
     is_available = serializers.SerializerMethodField()
+    genre = SlugChoiceField(Book.Genre)
     
     class Meta:
         model = Book
-        fields = '__all__'
+        fields = ('id', 'is_available', 'genre', 'title', 'author', 'isbn', 'publication_date',
+                 'description', 'total_copies', 'available_copies', 'created_at', 'updated_at')
         read_only_fields = ('id', 'created_at', 'updated_at')
     
     @extend_schema_field(serializers.BooleanField)
@@ -151,11 +203,7 @@ class BookSerializer(serializers.ModelSerializer):
         return obj.available_copies > 0
     
     def validate_isbn(self, value):
-        # Remove any hyphens or spaces for validation
-        isbn = value.replace('-', '').replace(' ', '')
-        if len(isbn) not in [10, 13]:
-            raise serializers.ValidationError("ISBN must be 10 or 13 digits long.")
-        return isbn
+        return _validate_isbn(value)
     
     def validate(self, attrs):
         if 'available_copies' in attrs and 'total_copies' in attrs:
@@ -164,47 +212,75 @@ class BookSerializer(serializers.ModelSerializer):
         return attrs
 
 
+class BookListSerializer(BookSerializer):
+    """Book list rows, without the long description text"""
+    class Meta(BookSerializer.Meta):
+        fields = ('id', 'is_available', 'genre', 'title', 'author', 'isbn', 'publication_date',
+                 'total_copies', 'available_copies', 'created_at', 'updated_at')
+    
+    @classmethod
+    def prefetch_queryset(cls, queryset):
+        """Load only the columns the list renders"""
+        return queryset.only(*(field for field in cls.Meta.fields if field != 'is_available'))
+
+
 class BookCreateUpdateSerializer(serializers.ModelSerializer):
     """Serializer for creating/updating books"""
+    genre = SlugChoiceField(Book.Genre)
+    
     class Meta:
         model = Book
         fields = ('title', 'author', 'isbn', 'publication_date', 'genre', 
                  'description', 'total_copies', 'available_copies')
+        extra_kwargs = {'isbn': {'validators': []}}
+    
+    def validate(self, attrs):
+        # Partial updates fall back to the stored value of the missing field
+        total_copies = attrs.get('total_copies', getattr(self.instance, 'total_copies', None))
+        available_copies = attrs.get('available_copies', getattr(self.instance, 'available_copies', None))
+        if None not in (total_copies, available_copies) and available_copies > total_copies:
+            raise serializers.ValidationError("Available copies cannot exceed total copies.")
+        return attrs
     
     def validate_isbn(self, value):
-        isbn = value.replace('-', '').replace(' ', '')
-        if len(isbn) not in [10, 13]:
-            raise serializers.ValidationError("ISBN must be 10 or 13 digits long.")
-        
-        # Check for uniqueness during update
-        if self.instance:
-            if Book.objects.filter(isbn=isbn).exclude(pk=self.instance.pk).exists():
-                raise serializers.ValidationError("Book with this ISBN already exists.")
-        else:
-            if Book.objects.filter(isbn=isbn).exists():
-                raise serializers.ValidationError("Book with this ISBN already exists.")
-        
-        return isbn
+        return _validate_isbn(value)
+    
+    def save(self, **kwargs):
+        # ISBN uniqueness is left to the unique index instead of a SELECT per write
+        try:
+            with transaction.atomic():
+                return super().save(**kwargs)
+        except IntegrityError:
+            duplicates = Book.objects.filter(isbn=self.validated_data.get('isbn'))
+            if self.instance is not None:
+                duplicates = duplicates.exclude(pk=self.instance.pk)
+            if duplicates.exists():
+                raise serializers.ValidationError({'isbn': ["Book with this ISBN already exists."]})
+            raise
 
 
 class RentalSerializer(serializers.ModelSerializer):
     """Serializer for Rental model"""
     user_email = serializers.EmailField(source='user.email', read_only=True)
-    user_name = serializers.SerializerMethodField()
+    user_name = serializers.CharField(source='user.full_name', read_only=True)
     book_title = serializers.CharField(source='book.title', read_only=True)
     book_author = serializers.CharField(source='book.author', read_only=True)
     is_overdue = serializers.SerializerMethodField()
     days_until_due = serializers.SerializerMethodField()
+    status = SlugChoiceField(Rental.Status, read_only=True)
     
     class Meta:
         model = Rental
-        fields = '__all__'
+        fields = ('id', 'user_email', 'user_name', 'book_title', 'book_author', 'is_overdue',
+                 'days_until_due', 'status', 'rented_at', 'due_date', 'returned_at',
+                 'created_at', 'updated_at', 'user', 'book')
         read_only_fields = ('id', 'rented_at', 'created_at', 'updated_at', 'user_email', 
                            'user_name', 'book_title', 'book_author', 'is_overdue', 'days_until_due')
     
-    @extend_schema_field(serializers.CharField)
-    def get_user_name(self, obj: Rental) -> str:
-        return f"{obj.user.first_name} {obj.user.last_name}"
+    @classmethod
+    def prefetch_queryset(cls, queryset):
+        """Join the user and book rows the nested source fields read"""
+        return queryset.select_related('user', 'book')
     
     @extend_schema_field(serializers.BooleanField)
     def get_is_overdue(self, obj: Rental) -> bool:
@@ -212,12 +288,57 @@ class RentalSerializer(serializers.ModelSerializer):
     
     @extend_schema_field(serializers.IntegerField(allow_null=True))
     def get_days_until_due(self, obj: Rental):
-        if obj.status == 'returned':
+        if obj.status == Rental.Status.RETURNED:
             return None
         days = (obj.due_date.date() - timezone.now().date()).days
         return days
 
 
+# Columns read by serialize_rentals
+RENTAL_ROW_FIELDS = (
+    'id', 'status', 'rented_at', 'due_date', 'returned_at', 'created_at', 'updated_at',
+    'user', 'user__email', 'user__first_name', 'user__last_name',
+    'book', 'book__title', 'book__author',
+)
+
+_datetime_field = serializers.DateTimeField()
+
+
+def serialize_rentals(rows):
+    """
+    Render .values(*RENTAL_ROW_FIELDS) rows exactly like RentalSerializer,
+    without building model instances or binding serializer fields per row
+    """
+    now = timezone.now()
+    today = now.date()
+    as_datetime = _datetime_field.to_representation
+    data = []
+    for row in rows:
+        rental_status = row['status']
+        returned_at = row['returned_at']
+        data.append({
+            'id': str(row['id']),
+            'user_email': row['user__email'],
+            'user_name': f"{row['user__first_name']} {row['user__last_name']}",
+            'book_title': row['book__title'],
+            'book_author': row['book__author'],
+            'is_overdue': rental_status == Rental.Status.ACTIVE and now > row['due_date'],
+            'days_until_due': (
+                None if rental_status == Rental.Status.RETURNED
+                else (row['due_date'].date() - today).days
+            ),
+            'status': Rental.Status(rental_status).slug,
+            'rented_at': as_datetime(row['rented_at']),
+            'due_date': as_datetime(row['due_date']),
+            'returned_at': as_datetime(returned_at) if returned_at is not None else None,
+            'created_at': as_datetime(row['created_at']),
+            'updated_at': as_datetime(row['updated_at']),
+            'user': row['user'],
+            'book': row['book'],
+        })
+    return data
+
+
 class RentalCreateSerializer(serializers.ModelSerializer):
     """Serializer for creating rentals"""
     rental_period_days = serializers.IntegerField(write_only=True, default=14, min_value=1, max_value=30)
@@ -226,27 +347,6 @@ class RentalCreateSerializer(serializers.ModelSerializer):
         model = Rental
         fields = ('book', 'rental_period_days')
     
-    def validate_book(self, value):
-        if value.available_copies <= 0:
-            raise serializers.ValidationError("This book is not available for rental.")
-        return value
-    
-    def validate(self, attrs):
-        user = self.context['request'].user
-        book = attrs['book']
-        
-        # Check if user already has an active rental for this book
-        active_rental = Rental.objects.filter(
-            user=user, 
-            book=book, 
-            status__in=['active', 'overdue']
-        ).exists()
-        
-        if active_rental:
-            raise serializers.ValidationError("You already have an active rental for this book.")
-        
-        return attrs
-    
     def create(self, validated_data):
         rental_period = validated_data.pop('rental_period_days', 14)
         user = self.context['request'].user
@@ -255,50 +355,127 @@ class RentalCreateSerializer(serializers.ModelSerializer):
         # Set due date
         due_date = timezone.now() + timedelta(days=rental_period)
         
-        # Create rental
-        rental = Rental.objects.create(
-            user=user,
-            book=book,
-            due_date=due_date,
-            status='active'
-        )
-        
-        # Decrease available copies
-        book.available_copies -= 1
-        book.save()
+        try:
+            with transaction.atomic():
+                # Decrease available copies; the guard makes concurrent
+                # rentals of the last copy fail instead of going negative
+                updated = Book.objects.filter(pk=book.pk, available_copies__gt=0).update(
+                    available_copies=F('available_copies') - 1,
+                    updated_at=timezone.now()
+                )
+                if not updated:
+                    raise serializers.ValidationError({'book': ["This book is not available for rental."]})
+                
+                # Create rental; the rental_one_open_per_user_book constraint
+                # rejects a second open rental of the same book
+                rental = Rental.objects.create(
+                    user=user,
+                    book=book,
+                    due_date=due_date,
+                    status=Rental.Status.ACTIVE
+                )
+        except IntegrityError:
+            raise serializers.ValidationError({
+                api_settings.NON_FIELD_ERRORS_KEY: ["You already have an active rental for this book."]
+            })
         
         return rental
 
 
+class RentalBulkCreateSerializer(serializers.Serializer):
+    """Serializer for renting several books in one request"""
+    book_ids = serializers.ListField(child=serializers.UUIDField(), min_length=1, max_length=10)
+    rental_period_days = serializers.IntegerField(write_only=True, default=14, min_value=1, max_value=30)
+    
+    def validate_book_ids(self, value):
+        if len(set(value)) != len(value):
+            raise serializers.ValidationError("Each book can only be rented once per request.")
+        
+        # One query for the whole batch; handed to create() through the context
+        books = Book.objects.in_bulk(value)
+        missing = [str(book_id) for book_id in value if book_id not in books]
+        if missing:
+            raise serializers.ValidationError(f"Books not found: {', '.join(missing)}")
+        
+        self.context['books'] = books
+        return value
+    
+    def create(self, validated_data):
+        user = self.context['request'].user
+        books = self.context['books']
+        book_ids = validated_data['book_ids']
+        now = timezone.now()
+        due_date = now + timedelta(days=validated_data['rental_period_days'])
+        
+        try:
+            with transaction.atomic():
+                # Same guard as RentalCreateSerializer, applied to the whole
+                # batch; any book without a free copy rolls everything back
+                updated = Book.objects.filter(pk__in=book_ids, available_copies__gt=0).update(
+                    available_copies=F('available_copies') - 1,
+                    updated_at=now
+                )
+                if updated != len(book_ids):
+                    raise serializers.ValidationError({
+                        'book_ids': ["One or more of these books is not available for rental."]
+                    })
+                
+                rentals = Rental.objects.bulk_create([
+                    Rental(user=user, book=books[book_id], due_date=due_date, status=Rental.Status.ACTIVE)
+                    for book_id in book_ids
+                ])
+        except IntegrityError:
+            raise serializers.ValidationError({
+                api_settings.NON_FIELD_ERRORS_KEY: ["You already have an active rental for one of these books."]
+            })
+        
+        return rentals
+
+
 class RentalReturnSerializer(serializers.Serializer):
     """Serializer for returning books"""
-    rental_id = serializers.UUIDField()
+    # Kept as a string; the ORM converts it once for the lookup
+    rental_id = serializers.RegexField(
+        r'^[0-9a-fA-F]{8}-[0-9a-fA-F]{4}-[0-9a-fA-F]{4}-[0-9a-fA-F]{4}-[0-9a-fA-F]{12}$',
+        error_messages={'invalid': 'Must be a valid UUID.'}
+    )
     
     def validate_rental_id(self, value):
         try:
-            rental = Rental.objects.get(id=value)
+            # Loaded with everything ReturnBookView updates and renders, and
+            # handed over through the context so the view doesn't fetch it again
+            rental = Rental.objects.select_related('user', 'book').get(id=value)
         except Rental.DoesNotExist:
             raise serializers.ValidationError("Rental not found.")
         
-        if rental.status == 'returned':
+        if rental.status == Rental.Status.RETURNED:
             raise serializers.ValidationError("This book has already been returned.")
         
+        self.context['rental'] = rental
         return value
 
 
+BOOK_ORDERING_CHOICES = (
+    'title', '-title', 'author', '-author',
+    'publication_date', '-publication_date',
+    'created_at', '-created_at',
+)
+
+
 class BookSearchSerializer(serializers.Serializer):
     """Serializer for book search parameters"""
     search = serializers.CharField(required=False, help_text="Search in title, author, or description")
-    genre = serializers.ChoiceField(choices=Book.GENRE_CHOICES, required=False)
+    genre = SlugChoiceField(Book.Genre, required=False)
     author = serializers.CharField(required=False)
-    publication_year = serializers.IntegerField(required=False, min_value=1000, max_value=timezone.now().year)
+    # Upper bound is evaluated per validation so it follows the calendar year
+    publication_year = serializers.IntegerField(
+        required=False,
+        min_value=1000,
+        validators=[MaxValueValidator(lambda: timezone.now().year)]
+    )
     available_only = serializers.BooleanField(required=False, default=False)
     ordering = serializers.ChoiceField(
-        choices=[
-            'title', '-title', 'author', '-author', 
-            'publication_date', '-publication_date', 
-            'created_at', '-created_at'
-        ],
+        choices=BOOK_ORDERING_CHOICES,
         required=False,
         default='-created_at'
     ) 
\ No newline at end of file
@@ -0,0 +1,45 @@
+import uuid
+
+from django.core.cache import cache
+from django.db.models.signals import post_delete, post_save
+
+from .models import CustomUser, Book, Rental
+
+
+DASHBOARD_STATS_CACHE_KEY = 'dashboard:stats'
+BOOK_CATALOG_VERSION_CACHE_KEY = 'books:catalog_version'
+
+
+def invalidate_dashboard_stats(sender, **kwargs):
+    """
+    Drop the cached dashboard stats when a counted row changes. Bulk
+    queryset updates send no signals and fall back to the cache timeout.
+    """
+    cache.delete(DASHBOARD_STATS_CACHE_KEY)
+
+
+for model in (CustomUser, Book, Rental):
+    post_save.connect(invalidate_dashboard_stats, sender=model, dispatch_uid=f'dashboard_stats_save_{model.__name__}')
+    post_delete.connect(invalidate_dashboard_stats, sender=model, dispatch_uid=f'dashboard_stats_delete_{model.__name__}')
+
+
+def get_book_catalog_version():
+    """Opaque token that changes whenever any book row changes"""
+    version = cache.get(BOOK_CATALOG_VERSION_CACHE_KEY)
+    if version is None:
+        version = uuid.uuid4().hex
+        if not cache.add(BOOK_CATALOG_VERSION_CACHE_KEY, version, None):
+            version = cache.get(BOOK_CATALOG_VERSION_CACHE_KEY, version)
+    return version
+
+
+def bump_book_catalog_version(sender=None, **kwargs):
+    """
+    Start a new catalog version. Connected to Book saves and deletes; the
+    F() copy updates on rent and return call it directly.
+    """
+    cache.set(BOOK_CATALOG_VERSION_CACHE_KEY, uuid.uuid4().hex, None)
+
+
+post_save.connect(bump_book_catalog_version, sender=Book, dispatch_uid='book_catalog_version_save')
+post_delete.connect(bump_book_catalog_version, sender=Book, dispatch_uid='book_catalog_version_delete')
@@ -28,6 +28,7 @@ urlpatterns = [
     # Rental endpoints
     path('rentals/', views.RentalListView.as_view(), name='rental_list'),
     path('rentals/create/', views.RentalCreateView.as_view(), name='rental_create'),
+    path('rentals/create/bulk/', views.RentalBulkCreateView.as_view(), name='rental_bulk_create'),
     path('rentals/<uuid:pk>/', views.RentalDetailView.as_view(), name='rental_detail'),
     path('rentals/return/', views.ReturnBookView.as_view(), name='return_book'),
     path('rentals/my/', views.MyRentalsView.as_view(), name='my_rentals'),
@@ -1,11 +1,18 @@
 from rest_framework import generics, status, permissions
-from rest_framework.decorators import api_view, permission_classes
 from rest_framework.response import Response
 from rest_framework.views import APIView
 from rest_framework_simplejwt.views import TokenObtainPairView, TokenRefreshView
+from rest_framework_simplejwt.exceptions import TokenError
 from rest_framework_simplejwt.tokens import RefreshToken
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+from django.http import JsonResponse
 from django.utils import timezone
-from django.db.models import Q
+from django.utils.decorators import method_decorator
+from django.views.decorators.http import condition, require_GET
+from django.views.decorators.vary import vary_on_headers
+from django.db.models import Count, F, Q, Sum
 from django.shortcuts import get_object_or_404
 from drf_spectacular.utils import extend_schema, OpenApiParameter
 from drf_spectacular.types import OpenApiTypes
@@ -13,15 +20,17 @@ from drf_spectacular.types import OpenApiTypes
 from .models import CustomUser, Book, Rental
 from .serializers import (
     CustomTokenObtainPairSerializer, UserRegistrationSerializer, 
-    UserProfileSerializer, UserUpdateSerializer, BookSerializer, 
-    BookCreateUpdateSerializer, RentalSerializer, RentalCreateSerializer,
-    RentalReturnSerializer, BookSearchSerializer, UserRegistrationResponseSerializer
+    UserProfileSerializer, UserUpdateSerializer, BookSerializer, BookListSerializer,
+    BookCreateUpdateSerializer, RentalSerializer, RentalCreateSerializer, RentalBulkCreateSerializer,
+    RentalReturnSerializer, BookSearchSerializer, UserRegistrationResponseSerializer,
+    RENTAL_ROW_FIELDS, serialize_rentals
 )
 from .permissions import (
     IsAdminUser, IsAdminOrReadOnly, IsOwnerOrAdmin, 
     CanManageBooks, CanManageRentals, IsAdminOrOwner
 )
-from .filters import BookFilter, RentalFilter
+from .filters import UserFilter, BookFilter, RentalFilter
+from .signals import DASHBOARD_STATS_CACHE_KEY, bump_book_catalog_version, get_book_catalog_version
 
 
 # Authentication Views
@@ -30,6 +39,7 @@ class CustomTokenObtainPairView(TokenObtainPairView):
     Custom login view that uses email instead of username
     """
     serializer_class = CustomTokenObtainPairSerializer
+    throttle_scope = 'login'
     
     @extend_schema(
         summary="User Login",
@@ -48,6 +58,7 @@ class UserRegistrationView(generics.CreateAPIView):
     queryset = CustomUser.objects.all()
     serializer_class = UserRegistrationSerializer
     permission_classes = [permissions.AllowAny]
+    throttle_scope = 'register'
     
     @extend_schema(
         summary="User Registration",
@@ -105,6 +116,7 @@ class LogoutView(APIView):
     Logout endpoint that blacklists the refresh token
     """
     permission_classes = [permissions.IsAuthenticated]
+    throttle_scope = 'logout'
     
     @extend_schema(
         summary="User Logout",
@@ -123,17 +135,22 @@ class LogoutView(APIView):
         }}
     )
     def post(self, request):
-        try:
-            refresh_token = request.data["refresh"]
-            token = RefreshToken(refresh_token)
-            token.blacklist()
+        refresh_token = request.data.get("refresh")
+        # RefreshToken(None) would mint a new token rather than fail
+        if not refresh_token:
             return Response({
-                "message": "Successfully logged out"
-            }, status=status.HTTP_200_OK)
-        except Exception as e:
+                "error": "Invalid refresh token"
+            }, status=status.HTTP_400_BAD_REQUEST)
+        
+        try:
+            RefreshToken(refresh_token).blacklist()
+        except TokenError:
             return Response({
                 "error": "Invalid refresh token"
             }, status=status.HTTP_400_BAD_REQUEST)
+        return Response({
+            "message": "Successfully logged out"
+        }, status=status.HTTP_200_OK)
 
 
 # User Management Views (Admin only)
@@ -144,11 +161,14 @@ class UserListView(generics.ListAPIView):
     queryset = CustomUser.objects.all()
     serializer_class = UserProfileSerializer
     permission_classes = [IsAdminUser]
-    filterset_fields = ['role', 'is_active']
+    filterset_class = UserFilter
     search_fields = ['email', 'first_name', 'last_name']
     ordering_fields = ['created_at', 'email', 'last_name']
     ordering = ['-created_at']
     
+    def get_queryset(self):
+        return UserProfileSerializer.prefetch_queryset(super().get_queryset()).order_by(*self.ordering)
+    
     @extend_schema(
         summary="List Users",
         description="Get a list of all users (Admin only)",
@@ -176,6 +196,22 @@ class UserDetailView(generics.RetrieveUpdateDestroyAPIView):
 
 
 # Book Views
+def book_catalog_etag(request, *args, **kwargs):
+    """
+    Cache-held catalog version, so the ETag costs no query; any book change
+    starts a new version (see signals.py). Without a shared cache a worker
+    can't see another worker's bump, so no ETag is sent at all
+    """
+    if not settings.BOOK_CONDITIONAL_GET:
+        return None
+    return get_book_catalog_version()
+
+
+# JSON and the browsable API share the ETag, so caches must key on Accept
+book_conditional_get = [vary_on_headers('Accept'), condition(etag_func=book_catalog_etag)]
+
+
+@method_decorator(book_conditional_get, name='get')
 class BookListCreateView(generics.ListCreateAPIView):
     """
     List books with search/filtering or create a new book
@@ -187,10 +223,16 @@ class BookListCreateView(generics.ListCreateAPIView):
     ordering_fields = ['title', 'author', 'publication_date', 'created_at']
     ordering = ['-created_at']
     
+    def get_queryset(self):
+        queryset = super().get_queryset()
+        if self.request.method == 'GET':
+            queryset = BookListSerializer.prefetch_queryset(queryset)
+        return queryset
+    
     def get_serializer_class(self):
         if self.request.method == 'POST':
             return BookCreateUpdateSerializer
-        return BookSerializer
+        return BookListSerializer
     
     @extend_schema(
         summary="List Books",
@@ -202,7 +244,7 @@ class BookListCreateView(generics.ListCreateAPIView):
             OpenApiParameter(name='available_only', type=OpenApiTypes.BOOL, description='Show only available books'),
             OpenApiParameter(name='publication_year', type=OpenApiTypes.INT, description='Filter by publication year'),
         ],
-        responses={200: BookSerializer(many=True)}
+        responses={200: BookListSerializer(many=True)}
     )
     def get(self, request, *args, **kwargs):
         return super().get(request, *args, **kwargs)
@@ -217,6 +259,7 @@ class BookListCreateView(generics.ListCreateAPIView):
         return super().post(request, *args, **kwargs)
 
 
+@method_decorator(book_conditional_get, name='get')
 class BookDetailView(generics.RetrieveUpdateDestroyAPIView):
     """
     Retrieve, update, or delete a specific book
@@ -256,7 +299,38 @@ class BookDetailView(generics.RetrieveUpdateDestroyAPIView):
 
 
 # Rental Views
-class RentalListView(generics.ListAPIView):
+class SchemaSafeQuerysetMixin:
+    """
+    Serve an empty queryset while drf-spectacular inspects the view, since
+    there is no authenticated user to scope it to. Subclasses implement
+    get_user_queryset instead of get_queryset
+    """
+    # drf-spectacular sets this on the view instances it builds for the schema
+    swagger_fake_view = False
+    
+    def get_queryset(self):
+        if self.swagger_fake_view:
+            return self.get_serializer_class().Meta.model.objects.none()
+        return self.get_user_queryset()
+    
+    def get_user_queryset(self):
+        raise NotImplementedError
+
+
+class RentalRowsListMixin:
+    """
+    Render rental list pages from .values() rows with serialize_rentals
+    instead of instantiating RentalSerializer per rental
+    """
+    def list(self, request, *args, **kwargs):
+        queryset = self.filter_queryset(self.get_queryset()).values(*RENTAL_ROW_FIELDS)
+        page = self.paginate_queryset(queryset)
+        if page is not None:
+            return self.get_paginated_response(serialize_rentals(page))
+        return Response(serialize_rentals(queryset))
+
+
+class RentalListView(SchemaSafeQuerysetMixin, RentalRowsListMixin, generics.ListAPIView):
     """
     List rentals - users see their own, admins see all
     """
@@ -266,14 +340,11 @@ class RentalListView(generics.ListAPIView):
     ordering_fields = ['rented_at', 'due_date', 'returned_at']
     ordering = ['-rented_at']
     
-    def get_queryset(self):
-        # Handle schema generation
-        if getattr(self, 'swagger_fake_view', False):
-            return Rental.objects.none()
-        
-        if self.request.user.role == 'admin':
-            return Rental.objects.all().select_related('user', 'book')
-        return Rental.objects.filter(user=self.request.user).select_related('book')
+    def get_user_queryset(self):
+        queryset = RentalSerializer.prefetch_queryset(Rental.objects.all())
+        if not self.request.user.is_admin:
+            queryset = queryset.filter(user=self.request.user)
+        return queryset.order_by(*self.ordering)
     
     @extend_schema(
         summary="List Rentals",
@@ -306,27 +377,51 @@ class RentalCreateView(generics.CreateAPIView):
         serializer = self.get_serializer(data=request.data)
         serializer.is_valid(raise_exception=True)
         rental = serializer.save()
+        # The F() copy decrement sends no post_save signal
+        bump_book_catalog_version()
         return Response(
             RentalSerializer(rental).data,
             status=status.HTTP_201_CREATED
         )
 
 
-class RentalDetailView(generics.RetrieveAPIView):
+class RentalBulkCreateView(APIView):
+    """
+    Rent several books at once
+    """
+    permission_classes = [permissions.IsAuthenticated]
+    
+    @extend_schema(
+        summary="Rent Several Books",
+        description="Create rentals for up to 10 books in one all-or-nothing request",
+        request=RentalBulkCreateSerializer,
+        responses={201: RentalSerializer(many=True)}
+    )
+    def post(self, request, *args, **kwargs):
+        serializer = RentalBulkCreateSerializer(data=request.data, context={'request': request})
+        serializer.is_valid(raise_exception=True)
+        rentals = serializer.save()
+        # bulk_create and the F() copy update send no post_save signals
+        cache.delete(DASHBOARD_STATS_CACHE_KEY)
+        bump_book_catalog_version()
+        return Response(
+            RentalSerializer(rentals, many=True).data,
+            status=status.HTTP_201_CREATED
+        )
+
+
+class RentalDetailView(SchemaSafeQuerysetMixin, generics.RetrieveAPIView):
     """
     Get details of a specific rental
     """
     serializer_class = RentalSerializer
     permission_classes = [CanManageRentals]
     
-    def get_queryset(self):
-        # Handle schema generation
-        if getattr(self, 'swagger_fake_view', False):
-            return Rental.objects.none()
-        
-        if self.request.user.role == 'admin':
-            return Rental.objects.all().select_related('user', 'book')
-        return Rental.objects.filter(user=self.request.user).select_related('book')
+    def get_user_queryset(self):
+        queryset = RentalSerializer.prefetch_queryset(Rental.objects.all())
+        if not self.request.user.is_admin:
+            queryset = queryset.filter(user=self.request.user)
+        return queryset
     
     @extend_schema(
         summary="Get Rental Details",
@@ -356,32 +451,46 @@ class ReturnBookView(APIView):
         }}
     )
     def post(self, request):
-        serializer = RentalReturnSerializer(data=request.data)
+        serializer = RentalReturnSerializer(data=request.data, context={'request': request})
         serializer.is_valid(raise_exception=True)
         
-        rental_id = serializer.validated_data['rental_id']
-        
         try:
             # Get the rental
-            if request.user.role == 'admin':
-                rental = Rental.objects.get(id=rental_id)
-            else:
-                rental = Rental.objects.get(id=rental_id, user=request.user)
+            rental = serializer.context['rental']
+            if not request.user.is_admin and rental.user_id != request.user.pk:
+                raise Rental.DoesNotExist
             
-            if rental.status == 'returned':
-                return Response({
-                    'error': 'This book has already been returned'
-                }, status=status.HTTP_400_BAD_REQUEST)
+            # Close the rental only if it is still open, so two concurrent
+            # returns can't both hand the copy back; the copy is incremented
+            # in SQL rather than read-modified-written
+            now = timezone.now()
+            with transaction.atomic():
+                returned = Rental.objects.filter(
+                    pk=rental.pk,
+                    status__in=[Rental.Status.ACTIVE, Rental.Status.OVERDUE]
+                ).update(status=Rental.Status.RETURNED, returned_at=now, updated_at=now)
+                if not returned:
+                    return Response({
+                        'error': 'This book has already been returned'
+                    }, status=status.HTTP_400_BAD_REQUEST)
+                
+                # Guarded like the rent decrement: if an admin already set the
+                # copies back to the total, the rental still closes instead of
+                # tripping the copies_lte_total constraint
+                Book.objects.filter(
+                    pk=rental.book_id,
+                    available_copies__lt=F('total_copies')
+                ).update(
+                    available_copies=F('available_copies') + 1,
+                    updated_at=now
+                )
+            # Queryset updates send no post_save signals
+            cache.delete(DASHBOARD_STATS_CACHE_KEY)
+            bump_book_catalog_version()
             
-            # Update rental
-            rental.status = 'returned'
-            rental.returned_at = timezone.now()
-            rental.save()
-            
-            # Increase available copies
-            book = rental.book
-            book.available_copies += 1
-            book.save()
+            rental.status = Rental.Status.RETURNED
+            rental.returned_at = now
+            rental.updated_at = now
             
             return Response({
                 'message': 'Book returned successfully',
@@ -400,6 +509,7 @@ class DashboardStatsView(APIView):
     Get dashboard statistics (Admin only)
     """
     permission_classes = [IsAdminUser]
+    cache_timeout = 30  # seconds; writes through the ORM invalidate sooner (see signals.py)
     
     @extend_schema(
         summary="Dashboard Statistics",
@@ -416,18 +526,41 @@ class DashboardStatsView(APIView):
         }}
     )
     def get(self, request):
-        stats = {
-            'total_books': Book.objects.count(),
-            'total_users': CustomUser.objects.filter(role='user').count(),
-            'active_rentals': Rental.objects.filter(status='active').count(),
-            'overdue_rentals': Rental.objects.filter(status='overdue').count(),
-            'available_books': Book.objects.filter(available_copies__gt=0).count(),
-            'total_available_copies': sum(Book.objects.values_list('available_copies', flat=True)),
-        }
+        stats = cache.get(DASHBOARD_STATS_CACHE_KEY)
+        if stats is None:
+            stats = self.compute_stats()
+            cache.set(DASHBOARD_STATS_CACHE_KEY, stats, self.cache_timeout)
         return Response(stats)
+    
+    def compute_stats(self):
+        now = timezone.now()
+        book_stats = Book.objects.aggregate(
+            total_books=Count('id'),
+            available_books=Count('id', filter=Q(available_copies__gt=0)),
+            total_available_copies=Sum('available_copies'),
+        )
+        rental_stats = Rental.objects.filter(
+            status__in=[Rental.Status.ACTIVE, Rental.Status.OVERDUE]
+        ).aggregate(
+            # Active rentals past due count as overdue only, so the two
+            # figures never include the same rental
+            active_rentals=Count('id', filter=Q(status=Rental.Status.ACTIVE, due_date__gte=now)),
+            overdue_rentals=Count('id', filter=(
+                Q(status=Rental.Status.OVERDUE) |
+                Q(status=Rental.Status.ACTIVE, due_date__lt=now)
+            )),
+        )
+        return {
+            'total_books': book_stats['total_books'],
+            'total_users': CustomUser.objects.filter(role=CustomUser.Role.USER).count(),
+            'active_rentals': rental_stats['active_rentals'],
+            'overdue_rentals': rental_stats['overdue_rentals'],
+            'available_books': book_stats['available_books'],
+            'total_available_copies': book_stats['total_available_copies'] or 0,
+        }
 
 
-class MyRentalsView(generics.ListAPIView):
+class MyRentalsView(SchemaSafeQuerysetMixin, RentalRowsListMixin, generics.ListAPIView):
     """
     Get current user's rentals
     """
@@ -436,12 +569,10 @@ class MyRentalsView(generics.ListAPIView):
     filterset_class = RentalFilter
     ordering = ['-rented_at']
     
-    def get_queryset(self):
-        # Handle schema generation
-        if getattr(self, 'swagger_fake_view', False):
-            return Rental.objects.none()
-        
-        return Rental.objects.filter(user=self.request.user).select_related('book')
+    def get_user_queryset(self):
+        return RentalSerializer.prefetch_queryset(
+            Rental.objects.filter(user=self.request.user)
+        ).order_by(*self.ordering)
     
     @extend_schema(
         summary="My Rentals",
@@ -453,43 +584,17 @@ class MyRentalsView(generics.ListAPIView):
 
 
 # Health Check
-class HealthCheckView(APIView):
-    """
-    Simple health check endpoint
-    """
-    permission_classes = [permissions.AllowAny]
-    
-    @extend_schema(
-        summary="Health Check",
-        description="Simple health check endpoint",
-        responses={200: {
-            'type': 'object',
-            'properties': {
-                'message': {'type': 'string'},
-                'timestamp': {'type': 'string', 'format': 'date-time'}
-            }
-        }}
-    )
-    def get(self, request):
-        return Response({
-            'message': 'Book Rental System API is running',
-            'timestamp': timezone.now()
-        })
-
-
-# Keep the function-based view as an alias
-@api_view(['GET'])
-@permission_classes([permissions.AllowAny])
-@extend_schema(
-    summary="Health Check",
-    description="Simple health check endpoint",
-    responses={200: {'message': 'string'}}
-)
+@require_GET
 def health_check(request):
     """
-    Simple health check endpoint
+    Liveness probe. A plain Django view, so load balancer polling skips DRF's
+    authentication, throttling and content negotiation
     """
-    return Response({
+    # Formatted like DRF's encoder; DjangoJSONEncoder would cut it to milliseconds
+    timestamp = timezone.now().isoformat()
+    if timestamp.endswith('+00:00'):
+        timestamp = timestamp[:-6] + 'Z'
+    return JsonResponse({
         'message': 'Book Rental System API is running',
-        'timestamp': timezone.now()
+        'timestamp': timestamp
     })
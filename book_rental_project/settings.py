@@ -92,6 +92,30 @@ else:
             'NAME': BASE_DIR / 'db.sqlite3',
         }
     }
+    # Covering indexes fall back to plain indexes on SQLite
+    SILENCED_SYSTEM_CHECKS = ['models.W040']
+
+# Cache
+# https://docs.djangoproject.com/en/5.2/topics/cache/
+
+# Shared Redis cache when REDIS_URL is set, per-process memory cache otherwise
+if os.getenv('REDIS_URL'):
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.redis.RedisCache',
+            'LOCATION': os.getenv('REDIS_URL'),
+        }
+    }
+else:
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+        }
+    }
+
+# Book ETags rely on a catalog version every worker can see, so conditional
+# GETs are only answered with a shared cache
+BOOK_CONDITIONAL_GET = bool(os.getenv('REDIS_URL'))
 
 # Custom User Model
 AUTH_USER_MODEL = 'api.CustomUser'
@@ -147,12 +171,27 @@ DEFAULT_AUTO_FIELD = 'django.db.models.BigAutoField'
 REST_FRAMEWORK = {
     'DEFAULT_AUTHENTICATION_CLASSES': ('rest_framework_simplejwt.authentication.JWTAuthentication',),
     'DEFAULT_PERMISSION_CLASSES': ('rest_framework.permissions.IsAuthenticated',),
-    'DEFAULT_PAGINATION_CLASS': 'rest_framework.pagination.PageNumberPagination', 
+    'DEFAULT_PAGINATION_CLASS': 'api.pagination.EstimatedCountPagination',
     'PAGE_SIZE': 10,
+    'DEFAULT_RENDERER_CLASSES': [
+        'api.renderers.ORJSONRenderer',
+        'rest_framework.renderers.BrowsableAPIRenderer',
+    ],
     'DEFAULT_SCHEMA_CLASS': 'drf_spectacular.openapi.AutoSchema',
-    'DEFAULT_FILTER_BACKENDS': ['django_filters.rest_framework.DjangoFilterBackend'],
-    'DEFAULT_THROTTLE_CLASSES': ['rest_framework.throttling.AnonRateThrottle', 'rest_framework.throttling.UserRateThrottle'],
-    'DEFAULT_THROTTLE_RATES': {'anon': '100/day', 'user': '1000/day'}
+    'DEFAULT_FILTER_BACKENDS': ['api.filters.QueryParamFilterBackend'],
+    'DEFAULT_THROTTLE_CLASSES': [
+        'rest_framework.throttling.AnonRateThrottle',
+        'rest_framework.throttling.UserRateThrottle',
+        # Only applies to views that set throttle_scope
+        'rest_framework.throttling.ScopedRateThrottle',
+    ],
+    'DEFAULT_THROTTLE_RATES': {
+        'anon': '100/day',
+        'user': '1000/day',
+        'login': '5/min',
+        'register': '10/hour',
+        'logout': '30/min',
+    }
 }
 
 SIMPLE_JWT = {